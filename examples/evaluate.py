@@ -1,12 +1,29 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+
 from sketch2fig.evaluator import evaluate
-import logging
 
 logging.basicConfig(level=logging.INFO)
 
-# Scenario 1: good — input vs reference (should score high)
-result = evaluate(
-    Path("tests/fixtures/simple_pipeline/input.png"),
-    Path("tests/fixtures/simple_pipeline/reference.png"),
-)
-print("overall:", result.overall, "pass:", result.passed)
+FIXTURES = Path("tests/fixtures")
+
+# Scenarios are independent, so run them concurrently — each evaluate() is a
+# network-bound Claude call, so threads (not processes) are the right pool.
+SCENARIOS = {
+    "good: input vs reference (should score high)": (
+        FIXTURES / "simple_pipeline/input.png",
+        FIXTURES / "simple_pipeline/reference.png",
+    ),
+    "bad: input vs unrelated figure (should score low)": (
+        FIXTURES / "simple_pipeline/input.png",
+        FIXTURES / "real_examples/4_schedule.png",
+    ),
+}
+
+with ThreadPoolExecutor(max_workers=len(SCENARIOS)) as pool:
+    futures = {name: pool.submit(evaluate, a, b) for name, (a, b) in SCENARIOS.items()}
+
+for name, future in futures.items():
+    result = future.result()
+    print(f"{name}: overall={result.overall} pass={result.passed}")
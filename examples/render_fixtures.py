@@ -0,0 +1,32 @@
+"""Regenerate reference.png for every fixture that has a reference.tex.
+
+Fixtures are independent, and pdflatex + pdftoppm are CPU-bound, so they
+render in parallel across cores (see docs/TESTING.md, "Creating New Test
+Fixtures").
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from sketch2fig.compiler import compile_tikz, render_to_file
+
+logging.basicConfig(level=logging.INFO)
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+
+def rebuild(fixture_dir: Path) -> str:
+    tex = (fixture_dir / "reference.tex").read_text()
+    pdf, log = compile_tikz(tex)
+    if pdf is None:
+        return f"{fixture_dir.name}: compile FAILED\n{log[-500:]}"
+    render_to_file(pdf, fixture_dir / "reference.png")
+    return f"{fixture_dir.name}: ok"
+
+
+if __name__ == "__main__":
+    dirs = sorted(d for d in FIXTURES.iterdir() if (d / "reference.tex").exists())
+    with ProcessPoolExecutor() as pool:
+        for line in pool.map(rebuild, dirs):
+            print(line)
@@ -28,7 +28,7 @@ def _setup_logging(verbose: bool) -> None:
 def convert(
     input_image: Annotated[Path, typer.Argument(help="Input figure image (PNG, JPEG, etc.)")],
     clean: Annotated[bool, typer.Option("--clean", help="Prompt for improved alignment and spacing")] = False,
-    max_iters: Annotated[int, typer.Option("--max-iters", help="Maximum refinement iterations")] = 5,
+    max_iters: Annotated[int, typer.Option("--max-iters", min=1, help="Maximum refinement iterations")] = 5,
     output_dir: Annotated[Path | None, typer.Option("--output-dir", help="Output directory")] = None,
     verbose: Annotated[bool, typer.Option("--verbose", "-v", help="Show debug logs")] = False,
 ) -> None:
@@ -53,9 +53,11 @@ def convert(
         raise typer.Exit(1)
 
     status = "PASS" if result.passed else "FAIL (below quality threshold)"
-    typer.echo(f"\nDone in {result.iterations} iteration(s) — score: {result.overall:.2f} — {status}")
-    typer.echo(f"  TikZ: {result.tex_path}")
-    typer.echo(f"  PNG:  {result.png_path}")
+    typer.echo(
+        f"\nDone in {result.iterations} iteration(s) — score: {result.overall:.2f} — {status}\n"
+        f"  TikZ: {result.tex_path}\n"
+        f"  PNG:  {result.png_path}"
+    )
 
     if not result.passed:
         sys.exit(0)  # not an error, just informational
@@ -1,8 +1,8 @@
 """TikZ compilation pipeline: TikZ code → PDF → PNG."""
 
+import hashlib
 import logging
 import re
-import shutil
 import subprocess
 import tempfile
 from dataclasses import dataclass
@@ -16,15 +16,15 @@ _DEFAULT_PREAMBLE = (
     Path(__file__).parent.parent.parent / "templates" / "preamble_default.tex"
 )
 
-_DOCUMENT_TEMPLATE = r"""\documentclass[border=5pt]{{standalone}}
-\usepackage{{tikz}}
-\usetikzlibrary{{calc,positioning,arrows.meta,shapes,backgrounds,fit,math}}
-\usepackage{{amsmath,amssymb}}
-{preamble}
-\begin{{document}}
-{tikz_code}
-\end{{document}}
+# Pre-split document skeleton: wrap_in_document is a plain join, with no
+# str.format parsing (and no brace escaping) on the per-compile path.
+_DOC_HEAD = r"""\documentclass[border=5pt]{standalone}
+\usepackage{tikz}
+\usetikzlibrary{calc,positioning,arrows.meta,shapes,backgrounds,fit,math}
+\usepackage{amsmath,amssymb}
 """
+_DOC_BEGIN = "\n\\begin{document}\n"
+_DOC_END = "\n\\end{document}\n"
 
 
 @dataclass
@@ -40,7 +40,7 @@ def wrap_in_document(tikz_code: str, preamble: str = "") -> str:
     The base template already includes tikz and common libraries.
     Pass an explicit preamble (or load DEFAULT_PREAMBLE yourself) to add more.
     """
-    return _DOCUMENT_TEMPLATE.format(preamble=preamble, tikz_code=tikz_code)
+    return "".join((_DOC_HEAD, preamble, _DOC_BEGIN, tikz_code, _DOC_END))
 
 
 DEFAULT_PREAMBLE: str = (
@@ -48,6 +48,47 @@ DEFAULT_PREAMBLE: str = (
 )
 
 
+_INLINE_WS_RE = re.compile(r"[ \t]+")
+
+
+def normalize_tikz(tikz_code: str) -> str:
+    """Collapse insignificant whitespace so trivially reformatted TikZ compares equal.
+
+    Newlines are preserved: a % comment runs to end of line, so joining or
+    splitting lines changes what TeX actually compiles. Blank lines are \\par,
+    which is an error inside a macro argument, so they stay significant too —
+    only runs of them (and leading/trailing ones) collapse.
+    """
+    normalized: list[str] = []
+    for raw in tikz_code.splitlines():
+        line = _INLINE_WS_RE.sub(" ", raw).strip()
+        if line or (normalized and normalized[-1]):
+            normalized.append(line)
+    while normalized and not normalized[-1]:
+        normalized.pop()
+    return "\n".join(normalized)
+
+
+# PDF bytes of successful compiles, keyed by hash of the normalized document.
+# The LLM often returns identical (or merely reformatted) TikZ across retries
+# and refinement iterations; a hit skips the whole pdflatex run.
+_compile_cache: dict[str, bytes] = {}
+
+
+def _cache_key(document: str) -> str:
+    return hashlib.sha256(normalize_tikz(document).encode("utf-8")).hexdigest()
+
+
+def _persist_pdf(pdf_bytes: bytes, output_dir: Path | None) -> Path:
+    """Write compiled PDF bytes to output_dir (or a fresh temp dir) as figure.pdf."""
+    if output_dir is None:
+        output_dir = Path(tempfile.mkdtemp(prefix="s2f_"))
+    output_dir.mkdir(parents=True, exist_ok=True)
+    dest = output_dir / "figure.pdf"
+    dest.write_bytes(pdf_bytes)
+    return dest
+
+
 def compile_tikz(
     tikz_code: str,
     preamble: str = "",
@@ -55,93 +96,143 @@ def compile_tikz(
 ) -> tuple[Path | None, str]:
     """Compile TikZ code to PDF.
 
-    Returns (pdf_path, log_output). pdf_path is None on failure.
+    Returns (pdf_path, log_output). pdf_path is None on failure; log_output
+    is the pdflatex transcript on failure and empty on success.
     If output_dir is provided, the PDF is written there; otherwise a temp dir is used
     and the caller is responsible for consuming the file before gc.
     """
     document = wrap_in_document(tikz_code, preamble)
 
+    key = _cache_key(document)
+    cached = _compile_cache.get(key)
+    if cached is not None:
+        logger.debug("Compile cache hit (%s)", key[:12])
+        return _persist_pdf(cached, output_dir), ""
+
     with tempfile.TemporaryDirectory() as tmpdir:
         tmp = Path(tmpdir)
         tex_path = tmp / "figure.tex"
         tex_path.write_text(document, encoding="utf-8")
 
-        result = subprocess.run(
+        # batchmode keeps pdflatex quiet and skips terminal echo; the transcript
+        # still lands in figure.log, which we only read (and decode) on failure.
+        subprocess.run(
             [
                 "pdflatex",
-                "-interaction=nonstopmode",
+                "-interaction=batchmode",
                 "-halt-on-error",
+                "-no-shell-escape",
                 str(tex_path),
             ],
             cwd=tmpdir,
-            capture_output=True,
-            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
             timeout=30,
         )
-        log = result.stdout + result.stderr
 
         pdf_src = tmp / "figure.pdf"
         if not pdf_src.exists():
+            log_path = tmp / "figure.log"
+            log = log_path.read_text(errors="replace") if log_path.exists() else ""
             logger.debug("pdflatex failed; log:\n%s", log)
             return None, log
 
-        if output_dir is not None:
-            output_dir.mkdir(parents=True, exist_ok=True)
-            dest = output_dir / "figure.pdf"
-            shutil.copy2(pdf_src, dest)
-            return dest, log
+        pdf_bytes = pdf_src.read_bytes()
+        _compile_cache[key] = pdf_bytes
+        return _persist_pdf(pdf_bytes, output_dir), ""
 
-        # Caller wants a persistent path — copy next to a system tempfile
-        dest_dir = Path(tempfile.mkdtemp(prefix="s2f_"))
-        dest = dest_dir / "figure.pdf"
-        shutil.copy2(pdf_src, dest)
-        return dest, log
 
+# Rendered PNG bytes keyed by (hash of PDF bytes, dpi). Cached-compile PDFs
+# are byte-identical across iterations, so a refiner that returns repeat TikZ
+# skips pdftoppm as well as pdflatex.
+_render_cache: dict[tuple[str, int], bytes] = {}
 
-def render_to_image(pdf_path: Path, dpi: int = 300) -> Image.Image:
-    """Render first page of a PDF to a PIL Image at the given DPI."""
-    stem = pdf_path.stem
-    out_prefix = pdf_path.parent / stem
 
+def _run_pdftoppm(pdf_path: Path, dpi: int, out_prefix: Path) -> Path:
+    """Rasterize page 1 of a PDF to <out_prefix>.png and return that path."""
+    key = (hashlib.sha256(pdf_path.read_bytes()).hexdigest(), dpi)
+    out_png = out_prefix.with_suffix(".png")
+    cached = _render_cache.get(key)
+    if cached is not None:
+        logger.debug("Render cache hit (%s @ %d dpi)", key[0][:12], dpi)
+        out_png.write_bytes(cached)
+        return out_png
+
+    # Only page 1 is ever used — -f/-l stop pdftoppm from rasterizing the rest,
+    # and -singlefile gives a deterministic output name (no page suffix).
     subprocess.run(
-        ["pdftoppm", "-png", "-r", str(dpi), str(pdf_path), str(out_prefix)],
+        [
+            "pdftoppm",
+            "-png",
+            "-r",
+            str(dpi),
+            "-f",
+            "1",
+            "-l",
+            "1",
+            "-singlefile",
+            str(pdf_path),
+            str(out_prefix),
+        ],
         check=True,
         capture_output=True,
         timeout=30,
     )
 
-    # pdftoppm names the first page <prefix>-1.png
-    candidates = sorted(pdf_path.parent.glob(f"{stem}-*.png"))
-    if not candidates:
+    if not out_png.exists():
         raise FileNotFoundError(f"pdftoppm produced no PNG from {pdf_path}")
-    return Image.open(candidates[0])
+    _render_cache[key] = out_png.read_bytes()
+    return out_png
+
+
+def render_to_image(pdf_path: Path, dpi: int = 300) -> Image.Image:
+    """Render first page of a PDF to a PIL Image at the given DPI."""
+    return Image.open(_run_pdftoppm(pdf_path, dpi, pdf_path.parent / pdf_path.stem))
+
+
+def render_to_file(pdf_path: Path, dest: Path, dpi: int = 300) -> Path:
+    """Render first page of a PDF directly to dest (a .png path).
+
+    pdftoppm writes the file itself, so there is no decode/re-encode
+    round-trip through PIL for callers that only need the PNG on disk.
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    return _run_pdftoppm(pdf_path, dpi, dest.with_suffix(""))
+
+
+_LOG_TAIL_CHARS = 8192
+# An error report line: optional indent, one or more '!', then the message.
+_ERROR_RE = re.compile(r"^[ \t]*!+[ \t]*(?P<message>.*)$", re.MULTILINE)
+# TeX's l.<number> source-line reference, anchored at a line start.
+_LINE_REF_RE = re.compile(r"^l\.(\d+)\s", re.MULTILINE)
+_LINE_REF_SPAN = 1024  # chars after the error line to search for the l.<n> ref
+_CONTEXT_SPAN = 2048  # chars around the error materialized for context
 
 
 def parse_errors(log: str) -> list[LatexError]:
-    """Extract the first LaTeX error from a pdflatex log string."""
-    lines = log.splitlines()
-    errors: list[LatexError] = []
-
-    i = 0
-    while i < len(lines):
-        if lines[i].lstrip().startswith("!"):
-            message = lines[i].lstrip().lstrip("!").strip()
-            line_no: int | None = None
-
-            # Search forward for l.<number> line reference
-            for j in range(i + 1, min(i + 10, len(lines))):
-                m = re.match(r"l\.(\d+)\s", lines[j])
-                if m:
-                    line_no = int(m.group(1))
-                    break
-
-            context_start = max(0, i - 1)
-            context_end = min(len(lines), i + 5)
-            context = "\n".join(lines[context_start:context_end])
-
-            errors.append(LatexError(message=message, line=line_no, context=context))
-            # Only extract the first error per the spec
-            break
-        i += 1
-
-    return errors
+    """Extract the first LaTeX error from a pdflatex log string.
+
+    With -halt-on-error the failure sits at the end of the transcript, so only
+    the tail is considered, and compiled regexes find the error and its
+    l.<number> reference in one pass instead of a Python line loop.
+    """
+    if len(log) > _LOG_TAIL_CHARS:
+        log = log[-_LOG_TAIL_CHARS:]
+
+    m = _ERROR_RE.search(log)
+    if m is None:
+        return []
+
+    message = m.group("message").strip()
+
+    ref = _LINE_REF_RE.search(log, m.end(), m.end() + _LINE_REF_SPAN)
+    line_no = int(ref.group(1)) if ref else None
+
+    # Context: the line before the error through a few lines after it.
+    line_start = log.rfind("\n", 0, m.start("message")) + 1
+    prev_start = log.rfind("\n", 0, max(line_start - 1, 0)) + 1
+    context_lines = log[prev_start : line_start + _CONTEXT_SPAN].splitlines()
+    extra = 1 if prev_start < line_start else 0  # did we pick up a preceding line?
+    context = "\n".join(context_lines[: 5 + extra])
+
+    return [LatexError(message=message, line=line_no, context=context)]
@@ -1,12 +1,15 @@
 """Application settings and shared Claude API helper."""
 
 import base64
+import io
 import logging
 import re
 import time
+from functools import lru_cache
 from pathlib import Path
 
 import anthropic
+from PIL import Image
 from anthropic.types import ImageBlockParam, TextBlock, TextBlockParam
 from pydantic import AliasChoices, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -37,6 +40,56 @@ def _detect_media_type(path: Path, raw: bytes) -> str:
     return _EXT_MEDIA_TYPES.get(path.suffix.lower(), "image/png")
 
 
+def _image_block(path: Path) -> "ImageBlockParam":
+    """Build the base64 API content block for an image, caching by file identity.
+
+    The original input image rides along on every plan/generate/evaluate/refine
+    call; keying on (path, mtime, size) means it is read and encoded once per
+    conversion while re-rendered files are still picked up when they change.
+    """
+    stat = path.stat()
+    return _cached_image_block(str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+
+# Claude's vision pipeline downsamples anything past ~1568px on the long edge,
+# so larger uploads only cost encode time, bandwidth and ingest latency.
+_MAX_IMAGE_EDGE = 1568
+
+
+def _downscale_if_oversized(raw: bytes, media_type: str) -> tuple[bytes, str]:
+    """Shrink an image to the API's useful resolution before upload."""
+    img = Image.open(io.BytesIO(raw))
+    if max(img.size) <= _MAX_IMAGE_EDGE:
+        return raw, media_type
+    # draft() lets libjpeg decode at reduced scale; it's a no-op for PNG etc.
+    img.draft(None, (_MAX_IMAGE_EDGE, _MAX_IMAGE_EDGE))
+    img.thumbnail((_MAX_IMAGE_EDGE, _MAX_IMAGE_EDGE), Image.Resampling.BILINEAR)
+    buf = io.BytesIO()
+    if media_type == "image/jpeg":
+        img.convert("RGB").save(buf, format="JPEG", quality=85)
+        return buf.getvalue(), media_type
+    img.save(buf, format="PNG")
+    return buf.getvalue(), "image/png"
+
+
+@lru_cache(maxsize=8)
+def _cached_image_block(path_str: str, mtime_ns: int, size: int) -> "ImageBlockParam":
+    path = Path(path_str)
+    raw = path.read_bytes()
+    media_type = _detect_media_type(path, raw)
+    try:
+        raw, media_type = _downscale_if_oversized(raw, media_type)
+    except OSError:
+        logger.debug("Could not downscale %s; sending as-is", path.name)
+    # base64 output is pure ASCII; decode accordingly and let `raw` go out of
+    # scope here instead of keeping both buffers alive for the whole request.
+    data = base64.standard_b64encode(raw).decode("ascii")
+    return ImageBlockParam(
+        type="image",
+        source={"type": "base64", "media_type": media_type, "data": data},  # type: ignore[arg-type]
+    )
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_prefix="SKETCH2FIG_",
@@ -45,6 +98,8 @@ class Settings(BaseSettings):
     )
 
     model: str = "claude-sonnet-4-6"
+    # Opt-in on-disk cache of planner output (SKETCH2FIG_PLAN_CACHE=1).
+    plan_cache: bool = False
     # Read ANTHROPIC_API_KEY (standard name, no prefix) or SKETCH2FIG_ANTHROPIC_API_KEY
     anthropic_api_key: str = Field(
         default="",
@@ -58,6 +113,20 @@ settings = Settings()
 _MAX_RETRIES = 3
 _RETRY_BASE_WAIT = 30  # seconds
 
+_client: anthropic.Anthropic | None = None
+
+
+def _get_client() -> anthropic.Anthropic:
+    """Return the shared Anthropic client, creating it on first use.
+
+    A single client reuses its HTTP connection pool across the many calls a
+    conversion makes (plan, generate, fix, evaluate, refine per iteration).
+    """
+    global _client
+    if _client is None:
+        _client = anthropic.Anthropic(api_key=settings.anthropic_api_key or None)
+    return _client
+
 
 def call_claude(
     system: str,
@@ -78,19 +147,17 @@ def call_claude(
     Returns:
         Raw text from Claude's first content block.
     """
-    client = anthropic.Anthropic(api_key=settings.anthropic_api_key or None)
+    client = _get_client()
 
     content: list[ImageBlockParam | TextBlockParam] = []
     for path in image_paths or []:
-        raw = path.read_bytes()
-        data = base64.standard_b64encode(raw).decode("utf-8")
-        media_type = _detect_media_type(path, raw)
-        content.append(
-            ImageBlockParam(
-                type="image",
-                source={"type": "base64", "media_type": media_type, "data": data},  # type: ignore[arg-type]
-            )
-        )
+        content.append(_image_block(path))
+
+    if content:
+        # The first image is always the original input, which is identical
+        # across iterations — a cache breakpoint here lets the API reuse the
+        # system prompt + input image prefix on every evaluate/refine call.
+        content[0] = {**content[0], "cache_control": {"type": "ephemeral"}}  # type: ignore[misc]
 
     if response_format == "json":
         user_text = user_text + "\n\nIMPORTANT: Respond with a raw JSON object only. Do not write any prose, analysis, or explanation. Your entire response must start with `{` and end with `}`."
@@ -104,7 +171,9 @@ def call_claude(
             message = client.messages.create(
                 model=settings.model,
                 max_tokens=max_tokens,
-                system=system,
+                # cache_control on the system block enables prompt caching for
+                # the static per-stage prompts re-sent on every call.
+                system=[{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}],  # type: ignore[arg-type]
                 messages=messages,
             )
             break
@@ -117,9 +186,10 @@ def call_claude(
 
     usage = message.usage
     logger.info(
-        "Claude usage: input_tokens=%d output_tokens=%d",
+        "Claude usage: input_tokens=%d output_tokens=%d cache_read=%s",
         usage.input_tokens,
         usage.output_tokens,
+        getattr(usage, "cache_read_input_tokens", None),
     )
 
     block = message.content[0]
@@ -128,19 +198,28 @@ def call_claude(
     return block.text
 
 
+_FENCE_OPEN_RE = re.compile(r"^```[a-z]*\n?")
+_FENCE_CLOSE_RE = re.compile(r"\n?```$")
+_TIKZ_FENCE_RE = re.compile(r"```(?:latex|tex)?\n?(.*?)```", re.DOTALL)
+
+
 def strip_json_fences(text: str) -> str:
     """Remove markdown code fences from a JSON response, if present."""
     text = text.strip()
-    text = re.sub(r"^```[a-z]*\n?", "", text)
-    text = re.sub(r"\n?```$", "", text)
-    return text.strip()
+    # Fast path: with the raw-JSON reminder in place, most responses have no
+    # fences at all, so skip the regex passes entirely.
+    if not text.startswith("```"):
+        return text
+    text = _FENCE_OPEN_RE.sub("", text)
+    return _FENCE_CLOSE_RE.sub("", text).strip()
 
 
 def extract_tikz_block(text: str) -> str:
     """Extract the tikzpicture environment from a fenced code block response."""
-    # Try to find content inside ```latex ... ``` or ``` ... ```
-    m = re.search(r"```(?:latex|tex)?\n?(.*?)```", text, re.DOTALL)
+    # If no fence, return as-is (might already be a raw block)
+    if "```" not in text:
+        return text.strip()
+    m = _TIKZ_FENCE_RE.search(text)
     if m:
         return m.group(1).strip()
-    # If no fence, return as-is (might already be a raw block)
     return text.strip()
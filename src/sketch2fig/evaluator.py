@@ -26,15 +26,17 @@ class EvalResult:
     issues: list[dict] = field(default_factory=list)
     passed: bool = False
     overall: float = 0.0
+    # Issues pre-bucketed by severity so consumers don't re-scan per iteration.
+    major: list[dict] = field(default_factory=list)
+    minor: list[dict] = field(default_factory=list)
 
 
 def _compute_overall(scores: dict[str, float]) -> float:
     return sum(scores.get(k, 0) * w for k, w in _WEIGHTS.items()) + _COMPILABILITY_SCORE
 
 
-def _is_pass(overall: float, issues: list[dict]) -> bool:
-    has_major = any(i.get("severity") == "major" for i in issues)
-    return overall >= 8.0 and not has_major
+def _is_pass(overall: float, major: list[dict]) -> bool:
+    return overall >= 8.0 and not major
 
 
 def evaluate(input_image: Path, rendered_image: Path) -> EvalResult:
@@ -67,11 +69,13 @@ def evaluate(input_image: Path, rendered_image: Path) -> EvalResult:
 
     scores: dict[str, float] = data.get("scores", {})
     issues: list[dict] = data.get("issues", [])
+    major = [i for i in issues if i.get("severity") == "major"]
+    minor = [i for i in issues if i.get("severity") == "minor"]
 
     overall = _compute_overall(scores)
     scores["overall"] = round(overall, 2)
 
-    passed = _is_pass(overall, issues)
+    passed = _is_pass(overall, major)
 
     logger.info(
         "Scores: overall=%.2f completeness=%s structure=%s text=%s aesthetic=%s — %s",
@@ -91,4 +95,11 @@ def evaluate(input_image: Path, rendered_image: Path) -> EvalResult:
                 issue.get("description", ""),
             )
 
-    return EvalResult(scores=scores, issues=issues, passed=passed, overall=overall)
+    return EvalResult(
+        scores=scores,
+        issues=issues,
+        passed=passed,
+        overall=overall,
+        major=major,
+        minor=minor,
+    )
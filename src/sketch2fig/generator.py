@@ -30,7 +30,7 @@ def generate_tikz(plan: dict, image_path: Path, preamble: str = "") -> str:
     logger.info("Generating TikZ for: %s", image_path)
     response = call_claude(
         system=GENERATOR_SYSTEM,
-        user_text=generator_user(json.dumps(plan, indent=2), preamble),
+        user_text=generator_user(json.dumps(plan), preamble),
         image_paths=[image_path],
         response_format="text",
     )
@@ -58,9 +58,7 @@ def fix_compile_error(tikz_code: str, errors: "list[LatexError]", log: str) -> s
 
 def refine_tikz(tikz_code: str, eval_result: "EvalResult", input_image: Path) -> str:
     """Refine TikZ code based on evaluator critique, sending the original image for reference."""
-    critique = json.dumps(
-        {"scores": eval_result.scores, "issues": eval_result.issues}, indent=2
-    )
+    critique = json.dumps({"scores": eval_result.scores, "issues": eval_result.issues})
     logger.info("Refining TikZ (score was %.2f)", eval_result.overall)
     response = call_claude(
         system=REFINER_SYSTEM,
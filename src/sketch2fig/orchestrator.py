@@ -1,11 +1,14 @@
 """Main agentic loop: Plan → Generate → Compile → Evaluate → Refine."""
 
 import logging
+import os
 import shutil
+import tempfile
+import threading
 from dataclasses import dataclass
 from pathlib import Path
 
-from .compiler import compile_tikz, parse_errors, render_to_image
+from .compiler import compile_tikz, normalize_tikz, parse_errors, render_to_file
 from .evaluator import EvalResult, evaluate
 from .generator import fix_compile_error, generate_tikz, refine_tikz
 from .planner import plan_figure
@@ -13,6 +16,10 @@ from .planner import plan_figure
 logger = logging.getLogger(__name__)
 
 _MAX_COMPILE_RETRIES = 3
+# Iteration renders only feed the evaluator, which downsamples anyway — 150 DPI
+# quarters the pixel work vs 300. The final artifact is re-rendered at full DPI.
+_ITERATION_DPI = 150
+_FINAL_DPI = 300
 
 
 @dataclass
@@ -24,6 +31,22 @@ class ConvertResult:
     iterations: int
 
 
+_WARMUP_TIKZ = r"\begin{tikzpicture}\path (0,0);\end{tikzpicture}"
+
+
+def _warm_latex() -> None:
+    """Compile a trivial document to warm kpathsea/font caches.
+
+    Runs in the background while the first (multi-second) planner call is in
+    flight, so the first real compile starts from a hot TeX installation.
+    """
+    try:
+        with tempfile.TemporaryDirectory(prefix="s2f_warm_") as tmpdir:
+            compile_tikz(_WARMUP_TIKZ, output_dir=Path(tmpdir))
+    except Exception:  # best effort — never let warmup break a conversion
+        logger.debug("LaTeX warmup failed", exc_info=True)
+
+
 def _compile_with_retries(
     tikz: str,
     preamble: str,
@@ -45,7 +68,13 @@ def _compile_with_retries(
             errors[0].message if errors else "unknown error",
         )
         if attempt < _MAX_COMPILE_RETRIES:
-            tikz = fix_compile_error(tikz, errors, log)
+            fixed = fix_compile_error(tikz, errors, log)
+            if normalize_tikz(fixed) == normalize_tikz(tikz):
+                # Recompiling code that only differs in whitespace would fail
+                # identically — bail out instead of burning another attempt.
+                logger.warning("Fix attempt returned unchanged code — giving up early")
+                break
+            tikz = fixed
     return None, tikz
 
 
@@ -59,6 +88,8 @@ def convert(
     """Run the full agentic loop and return a ConvertResult, or None if compilation never succeeded."""
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    threading.Thread(target=_warm_latex, daemon=True).start()
+
     # Step 1: Plan
     logger.info("=== Planning ===")
     plan = plan_figure(input_image, clean=clean)
@@ -77,10 +108,11 @@ def convert(
     tikz = generate_tikz(plan, input_image, preamble=preamble)
 
     last_result: EvalResult | None = None
-    last_tex: str = tikz
-    last_rendered: Path | None = None
-    prev_score: float = -1.0
-    plateau_count: int = 0
+    best_result: EvalResult | None = None
+    best_tex: str = tikz
+    best_rendered: Path | None = None
+    best_pdf: Path | None = None
+    best_iter: int = 0
 
     for iteration in range(1, max_iters + 1):
         logger.info("=== Iteration %d/%d ===", iteration, max_iters)
@@ -93,15 +125,10 @@ def convert(
             logger.error("Iteration %d: compilation failed after %d attempts — stopping", iteration, _MAX_COMPILE_RETRIES)
             break
 
-        # Render PDF → PNG
-        img = render_to_image(pdf)
-        rendered_path = iter_dir / "rendered.png"
-        img.save(str(rendered_path))
+        # Render PDF → PNG (low DPI — only the evaluator sees this)
+        rendered_path = render_to_file(pdf, iter_dir / "rendered.png", dpi=_ITERATION_DPI)
         (iter_dir / "figure.tex").write_text(tikz, encoding="utf-8")
 
-        last_tex = tikz
-        last_rendered = rendered_path
-
         # Step 4: Evaluate
         last_result = evaluate(input_image, rendered_path)
         logger.info(
@@ -111,46 +138,65 @@ def convert(
             last_result.passed,
         )
 
+        # Best-so-far tracking: the saved output is the best iteration, not the
+        # last, and oscillating scores (7, 6, 7, 6...) still stop early.
+        # A passing result always beats a non-passing one — a higher score with
+        # a major issue must not displace clean output.
+        if best_result is None or (last_result.passed, last_result.overall) > (
+            best_result.passed,
+            best_result.overall,
+        ):
+            best_result = last_result
+            best_tex = tikz
+            best_rendered = rendered_path
+            best_pdf = pdf
+            best_iter = iteration
+
         if last_result.passed:
             logger.info("Quality threshold reached.")
             break
 
-        # Plateau detection
-        if last_result.overall <= prev_score:
-            plateau_count += 1
-            if plateau_count >= 2:
-                logger.info("Score plateaued for 2 iterations — stopping early.")
-                break
-        else:
-            plateau_count = 0
-        prev_score = last_result.overall
+        if iteration - best_iter >= 2:
+            logger.info("No improvement on the best score for 2 iterations — stopping early.")
+            break
 
         if iteration == max_iters:
             logger.info("Max iterations reached.")
             break
 
         # Step 5: Refine for next iteration
-        major = [i for i in last_result.issues if i.get("severity") == "major"]
-        minor = [i for i in last_result.issues if i.get("severity") == "minor"]
         logger.info(
             "=== Refining: %d major, %d minor issue(s) ===",
-            len(major), len(minor),
+            len(last_result.major), len(last_result.minor),
         )
-        tikz = refine_tikz(tikz, last_result, input_image)
+        refined = refine_tikz(tikz, last_result, input_image)
+        if normalize_tikz(refined) == normalize_tikz(tikz):
+            logger.info("Refiner returned unchanged code — stopping early.")
+            break
+        tikz = refined
 
-    if last_rendered is None:
+    if best_rendered is None:
         return None
 
-    # Save final outputs
+    # Save final outputs — re-render the best iteration's PDF at full DPI
     final_tex = output_dir / "final.tex"
     final_png = output_dir / "final.png"
-    final_tex.write_text(last_tex, encoding="utf-8")
-    shutil.copy2(last_rendered, final_png)
+    final_tex.write_text(best_tex, encoding="utf-8")
+    if best_pdf is not None and best_pdf.exists():
+        render_to_file(best_pdf, final_png, dpi=_FINAL_DPI)
+    else:
+        # Hardlink is a metadata-only op; fall back to a byte copy when the
+        # target exists on another filesystem (or linking is unsupported).
+        final_png.unlink(missing_ok=True)
+        try:
+            os.link(best_rendered, final_png)
+        except OSError:
+            shutil.copy2(best_rendered, final_png)
 
     return ConvertResult(
         tex_path=final_tex,
         png_path=final_png,
-        passed=last_result.passed if last_result else False,
-        overall=last_result.overall if last_result else 0.0,
+        passed=best_result.passed if best_result else False,
+        overall=best_result.overall if best_result else 0.0,
         iterations=iteration,
     )
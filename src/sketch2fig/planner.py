@@ -1,14 +1,29 @@
 """Image → structured plan via Claude."""
 
+import hashlib
 import json
 import logging
+import os
+import tempfile
 from pathlib import Path
 
-from .config import call_claude, strip_json_fences
+from .config import call_claude, settings, strip_json_fences
 from .prompts import PLANNER_SYSTEM, planner_user
 
 logger = logging.getLogger(__name__)
 
+_PLAN_CACHE_DIR = Path.home() / ".cache" / "sketch2fig" / "plans"
+
+
+def _plan_cache_path(image_path: Path, clean: bool) -> Path:
+    """Cache key covers the image bytes, the clean flag, and the prompt text,
+    so editing PLANNER_SYSTEM invalidates old entries automatically."""
+    h = hashlib.sha256()
+    h.update(image_path.read_bytes())
+    h.update(PLANNER_SYSTEM.encode("utf-8"))
+    h.update(b"clean" if clean else b"")
+    return _PLAN_CACHE_DIR / f"{h.hexdigest()}.json"
+
 
 def plan_figure(image_path: Path, clean: bool = False) -> dict:
     """Analyze an image and return a structured JSON plan.
@@ -20,6 +35,11 @@ def plan_figure(image_path: Path, clean: bool = False) -> dict:
     Returns:
         Parsed JSON plan as a dict.
     """
+    cache_path = _plan_cache_path(image_path, clean) if settings.plan_cache else None
+    if cache_path is not None and cache_path.exists():
+        logger.info("Planning figure: %s (cached)", image_path)
+        return json.loads(cache_path.read_text(encoding="utf-8"))
+
     logger.info("Planning figure: %s", image_path)
     response = call_claude(
         system=PLANNER_SYSTEM,
@@ -27,7 +47,21 @@ def plan_figure(image_path: Path, clean: bool = False) -> dict:
         image_paths=[image_path],
         response_format="json",
     )
-    text = strip_json_fences(response)
-    plan = json.loads(text)
-    logger.debug("Plan: %s", json.dumps(plan, indent=2))
+    try:
+        # response_format="json" means bare JSON is the norm; parse directly
+        # and only pay for fence stripping when that fails.
+        plan = json.loads(response)
+    except json.JSONDecodeError:
+        plan = json.loads(strip_json_fences(response))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Plan: %s", json.dumps(plan, indent=2))
+
+    if cache_path is not None:
+        # Atomic write so a crashed run never leaves a truncated entry.
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(json.dumps(plan))
+        os.replace(tmp, cache_path)
+
     return plan
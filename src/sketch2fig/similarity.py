@@ -0,0 +1,110 @@
+"""Pixel-level image similarity for golden-reference tests (Tier 2)."""
+
+import numpy as np
+from PIL import Image
+
+# High-DPI renders run to millions of pixels; a global statistic stabilizes
+# well below that, so cap the comparison at ~512x512 worth of pixels.
+_MAX_COMPARE_PIXELS = 512 * 512
+
+
+def compute_ssim(img1: Image.Image, img2: Image.Image) -> float:
+    """Compute structural similarity. Returns 0-1 (1 = identical)."""
+    # Byte-identical images (common when an iteration re-renders unchanged
+    # TikZ) score 1.0 without any statistics — memcmp beats reduction passes.
+    if img1 is img2 or (
+        img1.size == img2.size and img1.mode == img2.mode and img1.tobytes() == img2.tobytes()
+    ):
+        return 1.0
+
+    # Resize to same dimensions. BOX averaging is the cheap resampler and is
+    # plenty for a perceptual statistic — we are not keeping these pixels.
+    size = (min(img1.width, img2.width), min(img1.height, img2.height))
+    if size[0] * size[1] > _MAX_COMPARE_PIXELS:
+        scale = (_MAX_COMPARE_PIXELS / (size[0] * size[1])) ** 0.5
+        size = (max(1, int(size[0] * scale)), max(1, int(size[1] * scale)))
+    if img1.size != size:
+        img1 = img1.resize(size, Image.Resampling.BOX)
+    if img2.size != size:
+        img2 = img2.resize(size, Image.Resampling.BOX)
+    if img1.mode != "L":
+        img1 = img1.convert("L")
+    if img2.mode != "L":
+        img2 = img2.convert("L")
+
+    # Zero-copy views of PIL's uint8 buffers. All second moments go through
+    # E[xy] - mu*mu with a float32 product, so the largest temporary is one
+    # float32 array — never the float64 deviation array arr.var() would build.
+    arr1 = np.asarray(img1)
+    arr2 = np.asarray(img2)
+
+    # Simple global SSIM (good enough for our purposes — see docs/TESTING.md)
+    mu1, mu2 = float(arr1.mean()), float(arr2.mean())
+    sigma1_sq = float(np.multiply(arr1, arr1, dtype=np.float32).mean()) - mu1 * mu1
+    sigma2_sq = float(np.multiply(arr2, arr2, dtype=np.float32).mean()) - mu2 * mu2
+    sigma12 = float(np.multiply(arr1, arr2, dtype=np.float32).mean()) - mu1 * mu2
+
+    C1 = (0.01 * 255) ** 2
+    C2 = (0.03 * 255) ** 2
+
+    ssim = ((2 * mu1 * mu2 + C1) * (2 * sigma12 + C2)) / (
+        (mu1**2 + mu2**2 + C1) * (sigma1_sq + sigma2_sq + C2)
+    )
+    return float(ssim)
+
+
+_COARSE_SIZE = (128, 128)
+_COARSE_MARGIN = 0.1
+
+
+def images_match(img1: Image.Image, img2: Image.Image, threshold: float = 0.95) -> bool:
+    """Two-stage similarity check: cheap coarse reject, then full-res confirm.
+
+    A 128x128 SSIM pass throws out clearly different images; only borderline
+    pairs pay for the full-resolution score.
+    """
+    coarse = compute_ssim(
+        img1.resize(_COARSE_SIZE, Image.Resampling.BOX),
+        img2.resize(_COARSE_SIZE, Image.Resampling.BOX),
+    )
+    if coarse < threshold - _COARSE_MARGIN:
+        return False
+    return compute_ssim(img1, img2) >= threshold
+
+
+def compute_ssim_batch(pairs: list[tuple[Image.Image, Image.Image]]) -> list[float]:
+    """Compute SSIM for many image pairs in one vectorized pass.
+
+    All images are resized to the smallest common dimensions and stacked, so
+    the per-pair statistics reduce over single NumPy arrays instead of looping.
+    """
+    if not pairs:
+        return []
+
+    flat = [img for pair in pairs for img in pair]
+    size = (min(i.width for i in flat), min(i.height for i in flat))
+
+    def _stack(images: list[Image.Image]) -> np.ndarray:
+        return np.stack(
+            [np.asarray(i.resize(size, Image.Resampling.BOX).convert("L")) for i in images]
+        )
+
+    a = _stack([p[0] for p in pairs])
+    b = _stack([p[1] for p in pairs])
+
+    axes = (1, 2)
+    mu1 = a.mean(axis=axes)
+    mu2 = b.mean(axis=axes)
+    # Same E[xy] - mu*mu moments as compute_ssim: float32 products, no
+    # float64 deviation arrays.
+    sigma1_sq = np.multiply(a, a, dtype=np.float32).mean(axis=axes) - mu1 * mu1
+    sigma2_sq = np.multiply(b, b, dtype=np.float32).mean(axis=axes) - mu2 * mu2
+    sigma12 = np.multiply(a, b, dtype=np.float32).mean(axis=axes) - mu1 * mu2
+
+    C1 = (0.01 * 255) ** 2
+    C2 = (0.03 * 255) ** 2
+
+    ssim = ((2 * mu1 * mu2 + C1) * (2 * sigma12 + C2)) / (
+        (mu1**2 + mu2**2 + C1) * (sigma1_sq + sigma2_sq + C2)
+    )
+    return [float(s) for s in ssim]
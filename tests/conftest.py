@@ -0,0 +1,24 @@
+"""Shared fixtures for the sketch2fig test suite."""
+
+import io
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+
+@pytest.fixture(scope="session")
+def dummy_png_bytes() -> bytes:
+    """A small valid PNG, encoded once per session."""
+    buf = io.BytesIO()
+    # compress_level=1: this PNG only needs to be valid, not small.
+    Image.new("RGB", (100, 100), "blue").save(buf, format="PNG", compress_level=1)
+    return buf.getvalue()
+
+
+@pytest.fixture
+def dummy_png(tmp_path: Path, dummy_png_bytes: bytes) -> Path:
+    """A valid PNG file under tmp_path, written from the session-encoded bytes."""
+    path = tmp_path / "input.png"
+    path.write_bytes(dummy_png_bytes)
+    return path
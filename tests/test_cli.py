@@ -0,0 +1,69 @@
+"""Tests for sketch2fig.cli — Tier 1 (fast, orchestrator mocked)."""
+
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+import sketch2fig.cli as cli
+from sketch2fig.cli import app
+from sketch2fig.orchestrator import ConvertResult
+
+# One in-process runner for the whole module — no subprocess, no re-import.
+runner = CliRunner()
+
+
+def _fake_result(out_dir: Path, passed: bool = True) -> ConvertResult:
+    return ConvertResult(
+        tex_path=out_dir / "final.tex",
+        png_path=out_dir / "final.png",
+        passed=passed,
+        overall=8.5 if passed else 5.0,
+        iterations=2,
+    )
+
+
+def test_missing_input_exits_with_error(tmp_path):
+    result = runner.invoke(app, ["convert", str(tmp_path / "nope.png")])
+    assert result.exit_code == 1
+    assert "does not exist" in result.output
+
+
+def test_invalid_max_iters_rejected_by_parser(dummy_png):
+    result = runner.invoke(app, ["convert", str(dummy_png), "--max-iters", "0"])
+    assert result.exit_code == 2  # rejected by click before the loop runs
+
+
+def test_convert_reports_success(tmp_path, dummy_png, monkeypatch):
+    monkeypatch.setattr(cli, "_convert", lambda **kw: _fake_result(tmp_path))
+
+    result = runner.invoke(app, ["convert", str(dummy_png)])
+    assert result.exit_code == 0
+    assert "PASS" in result.output
+    assert "8.50" in result.output
+
+
+def test_convert_reports_failed_compilation(tmp_path, dummy_png, monkeypatch):
+    monkeypatch.setattr(cli, "_convert", lambda **kw: None)
+
+    result = runner.invoke(app, ["convert", str(dummy_png)])
+    assert result.exit_code == 1
+    assert "Failed to compile" in result.output
+
+
+def test_convert_passes_options_through(tmp_path, dummy_png, monkeypatch):
+    seen: dict = {}
+
+    def fake_convert(**kwargs):
+        seen.update(kwargs)
+        return _fake_result(tmp_path)
+
+    monkeypatch.setattr(cli, "_convert", fake_convert)
+    out_dir = tmp_path / "out"
+    result = runner.invoke(
+        app,
+        ["convert", str(dummy_png), "--clean", "--max-iters", "3", "--output-dir", str(out_dir)],
+    )
+    assert result.exit_code == 0
+    assert seen["clean"] is True
+    assert seen["max_iters"] == 3
+    assert seen["output_dir"] == out_dir
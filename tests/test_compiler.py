@@ -5,6 +5,7 @@ from pathlib import Path
 
 from sketch2fig.compiler import (
     wrap_in_document,
+    normalize_tikz,
     parse_errors,
     compile_tikz,
     render_to_image,
@@ -19,31 +20,53 @@ _BAD_TIKZ = r"\begin{tikzpicture}\badcommand{foo}\end{tikzpicture}"
 # ── Tier 1: fast, no LaTeX required ──────────────────────────────────────────
 
 
-class TestWrapInDocument:
-    def test_contains_documentclass(self):
-        result = wrap_in_document(_SIMPLE_TIKZ)
-        assert r"\documentclass" in result
-
-    def test_uses_standalone(self):
-        result = wrap_in_document(_SIMPLE_TIKZ)
-        assert "standalone" in result
+@pytest.fixture(scope="module")
+def wrapped() -> str:
+    return wrap_in_document(_SIMPLE_TIKZ)
 
-    def test_contains_tikz_block(self):
-        result = wrap_in_document(_SIMPLE_TIKZ)
-        assert r"\begin{tikzpicture}" in result
 
-    def test_has_begin_document(self):
-        result = wrap_in_document(_SIMPLE_TIKZ)
-        assert r"\begin{document}" in result
-        assert r"\end{document}" in result
+class TestWrapInDocument:
+    @pytest.mark.parametrize(
+        "needle",
+        [
+            r"\documentclass",
+            "standalone",
+            r"\begin{tikzpicture}",
+            r"\begin{document}",
+            r"\end{document}",
+            "border=5pt",
+        ],
+    )
+    def test_contains(self, wrapped, needle):
+        assert needle in wrapped
 
     def test_custom_preamble_included(self):
         result = wrap_in_document(_SIMPLE_TIKZ, preamble=r"\usepackage{xcolor}")
         assert r"\usepackage{xcolor}" in result
 
-    def test_border_option_present(self):
-        result = wrap_in_document(_SIMPLE_TIKZ)
-        assert "border=5pt" in result
+
+class TestNormalizeTikz:
+    def test_inline_whitespace_collapsed(self):
+        assert normalize_tikz("\\draw   (0,0)\t--  (1,1);") == "\\draw (0,0) -- (1,1);"
+
+    def test_indentation_and_outer_blank_lines_dropped(self):
+        a = "\n  \\draw (0,0);\n    \\draw (1,1);\n\n"
+        b = "\\draw (0,0);\n\\draw (1,1);"
+        assert normalize_tikz(a) == normalize_tikz(b)
+
+    def test_blank_lines_are_significant(self):
+        # A blank line is \par — a compile error inside a macro argument.
+        assert normalize_tikz("\\node {multi\n\nline};") != normalize_tikz("\\node {multi\nline};")
+
+    def test_blank_line_runs_collapse_to_one(self):
+        assert normalize_tikz("\\draw;\n\n\n\n\\draw;") == normalize_tikz("\\draw;\n\n\\draw;")
+
+    def test_newlines_are_significant(self):
+        # A % comment runs to end of line — moving the line break changes
+        # whether the second \draw is commented out.
+        two_draws = "\\draw (0,0); % note\n\\draw (1,1);"
+        one_draw = "\\draw (0,0); % note \\draw (1,1);"
+        assert normalize_tikz(two_draws) != normalize_tikz(one_draw)
 
 
 class TestParseErrors:
@@ -104,21 +127,24 @@ def test_bad_tikz_fails_with_error():
     assert len(errors) >= 1
 
 
-@pytest.mark.slow
-def test_reference_fixture_compiles():
-    """The simple_pipeline reference fixture compiles without error."""
+@pytest.fixture(scope="module")
+def reference_pdf():
+    """The simple_pipeline reference fixture, compiled once for all Tier 2 tests."""
     tex = (FIXTURES / "simple_pipeline" / "reference.tex").read_text()
     pdf_path, log = compile_tikz(tex)
     assert pdf_path is not None, f"Reference fixture compilation failed:\n{log}"
+    return pdf_path
 
 
 @pytest.mark.slow
-def test_reference_fixture_renders_to_image():
-    """The simple_pipeline reference fixture renders to a PNG image."""
-    tex = (FIXTURES / "simple_pipeline" / "reference.tex").read_text()
-    pdf_path, log = compile_tikz(tex)
-    assert pdf_path is not None, f"Compilation failed:\n{log}"
+def test_reference_fixture_compiles(reference_pdf):
+    """The simple_pipeline reference fixture compiles without error."""
+    assert reference_pdf.exists()
+
 
-    img = render_to_image(pdf_path)
+@pytest.mark.slow
+def test_reference_fixture_renders_to_image(reference_pdf):
+    """The simple_pipeline reference fixture renders to a PNG image."""
+    img = render_to_image(reference_pdf)
     assert img.width > 0
     assert img.height > 0
@@ -0,0 +1,34 @@
+"""Tests for sketch2fig.config response-parsing helpers — Tier 1 (fast)."""
+
+from sketch2fig.config import extract_tikz_block, strip_json_fences
+
+
+class TestStripJsonFences:
+    def test_plain_json_untouched(self):
+        assert strip_json_fences('{"a": 1}') == '{"a": 1}'
+
+    def test_strips_bare_fences(self):
+        assert strip_json_fences('```\n{"a": 1}\n```') == '{"a": 1}'
+
+    def test_strips_language_fences(self):
+        assert strip_json_fences('```json\n{"a": 1}\n```') == '{"a": 1}'
+
+    def test_strips_surrounding_whitespace(self):
+        assert strip_json_fences('  {"a": 1}  \n') == '{"a": 1}'
+
+
+class TestExtractTikzBlock:
+    _TIKZ = "\\begin{tikzpicture}\\draw (0,0) -- (1,1);\\end{tikzpicture}"
+
+    def test_unfenced_passthrough(self):
+        assert extract_tikz_block(self._TIKZ) == self._TIKZ
+
+    def test_extracts_latex_fence(self):
+        assert extract_tikz_block(f"```latex\n{self._TIKZ}\n```") == self._TIKZ
+
+    def test_extracts_bare_fence(self):
+        assert extract_tikz_block(f"```\n{self._TIKZ}\n```") == self._TIKZ
+
+    def test_ignores_prose_around_fence(self):
+        text = f"Here is the figure:\n```tex\n{self._TIKZ}\n```\nLet me know!"
+        assert extract_tikz_block(text) == self._TIKZ
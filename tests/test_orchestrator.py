@@ -0,0 +1,180 @@
+"""Tests for sketch2fig.orchestrator — Tier 1 (fast, all LLM/LaTeX calls mocked)."""
+
+from collections import Counter
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import sketch2fig.orchestrator as orchestrator
+from sketch2fig.evaluator import EvalResult
+
+
+def _result(overall: float, passed: bool | None = None) -> EvalResult:
+    if passed is None:
+        passed = overall >= 8.0
+    major = [] if passed else [{"severity": "major", "description": "off"}]
+    return EvalResult(scores={"overall": overall}, overall=overall, passed=passed, major=major)
+
+
+@pytest.fixture
+def pipeline_mocks(monkeypatch, dummy_png_bytes):
+    """One mock stack for the whole loop; tests mutate the returned namespace.
+
+    ns.scores drives the evaluator (one entry per iteration), ns.refine_changes
+    controls whether the refiner returns new code, ns.calls counts invocations.
+    ns.compile_ok may be a bool or a list of per-call outcomes; ns.fix_returns
+    may be set to a callable to control what the compile fixer produces.
+    """
+    ns = SimpleNamespace(
+        scores=[5.0],
+        refine_changes=True,
+        compile_ok=True,
+        fix_returns=None,
+        calls=Counter(),
+    )
+
+    def fake_plan(image_path, clean=False):
+        ns.calls["plan"] += 1
+        return {"figure_type": "flowchart", "elements": [], "connections": []}
+
+    def fake_generate(plan, image_path, preamble=""):
+        ns.calls["generate"] += 1
+        return r"\begin{tikzpicture}\draw (0,0);\end{tikzpicture}"
+
+    def fake_compile(tikz, preamble="", output_dir=None):
+        ns.calls["compile"] += 1
+        if isinstance(ns.compile_ok, list):
+            ok = ns.compile_ok.pop(0) if ns.compile_ok else True
+        else:
+            ok = ns.compile_ok
+        if not ok:
+            return None, "! Something broke.\nl.1 \\draw\n"
+        pdf = output_dir / "figure.pdf"
+        pdf.write_bytes(b"%PDF-fake")
+        return pdf, ""
+
+    def fake_render(pdf_path, dest, dpi=300):
+        ns.calls["render"] += 1
+        dest.write_bytes(dummy_png_bytes)
+        return dest
+
+    def fake_evaluate(input_image, rendered_image):
+        i = ns.calls["evaluate"]
+        ns.calls["evaluate"] += 1
+        spec = ns.scores[min(i, len(ns.scores) - 1)]
+        # Entries are either an overall score or an (overall, passed) pair.
+        if isinstance(spec, tuple):
+            return _result(*spec)
+        return _result(spec)
+
+    def fake_refine(tikz, result, image_path):
+        ns.calls["refine"] += 1
+        return tikz + f"\n% refined {ns.calls['refine']}" if ns.refine_changes else tikz
+
+    def fake_fix(tikz, errors, log):
+        ns.calls["fix"] += 1
+        if ns.fix_returns is not None:
+            return ns.fix_returns(tikz)
+        return tikz  # unchanged → retry loop bails out early
+
+    monkeypatch.setattr(orchestrator, "plan_figure", fake_plan)
+    monkeypatch.setattr(orchestrator, "generate_tikz", fake_generate)
+    monkeypatch.setattr(orchestrator, "compile_tikz", fake_compile)
+    monkeypatch.setattr(orchestrator, "render_to_file", fake_render)
+    monkeypatch.setattr(orchestrator, "evaluate", fake_evaluate)
+    monkeypatch.setattr(orchestrator, "refine_tikz", fake_refine)
+    monkeypatch.setattr(orchestrator, "fix_compile_error", fake_fix)
+    monkeypatch.setattr(orchestrator, "_warm_latex", lambda: None)
+    return ns
+
+
+def test_stops_when_passed(tmp_path, dummy_png, pipeline_mocks):
+    pipeline_mocks.scores = [9.0]
+    result = orchestrator.convert(dummy_png, tmp_path / "out", max_iters=5)
+    assert result is not None
+    assert result.passed
+    assert result.iterations == 1
+    assert pipeline_mocks.calls["evaluate"] == 1
+
+
+def test_stops_when_refiner_returns_unchanged(tmp_path, dummy_png, pipeline_mocks):
+    pipeline_mocks.scores = [5.0]
+    pipeline_mocks.refine_changes = False
+    result = orchestrator.convert(dummy_png, tmp_path / "out", max_iters=5)
+    assert result is not None
+    assert not result.passed
+    assert result.iterations == 1
+
+
+def test_saves_best_iteration_not_last(tmp_path, dummy_png, pipeline_mocks):
+    pipeline_mocks.scores = [7.0, 6.0, 5.5]
+    result = orchestrator.convert(dummy_png, tmp_path / "out", max_iters=5)
+    assert result is not None
+    assert result.overall == 7.0
+    # Two iterations without beating the best score stop the loop early.
+    assert result.iterations == 3
+
+
+def test_returns_none_when_compilation_never_succeeds(tmp_path, dummy_png, pipeline_mocks):
+    pipeline_mocks.compile_ok = False
+    result = orchestrator.convert(dummy_png, tmp_path / "out", max_iters=5)
+    assert result is None
+    assert pipeline_mocks.calls["fix"] == 1
+
+
+def test_passing_iteration_beats_higher_failing_score(tmp_path, dummy_png, pipeline_mocks):
+    # Iteration 1 scores higher but fails on a major issue; iteration 2 passes.
+    # The passing code must be what gets saved and reported.
+    pipeline_mocks.scores = [(8.5, False), (8.2, True)]
+    result = orchestrator.convert(dummy_png, tmp_path / "out", max_iters=5)
+    assert result is not None
+    assert result.passed
+    assert result.overall == 8.2
+    assert result.iterations == 2
+
+
+def test_newline_only_fix_is_retried(tmp_path, dummy_png, pipeline_mocks, monkeypatch):
+    # A fix that only restores a line break after a % comment is a real change
+    # and must not be dismissed as "unchanged" by the whitespace comparison.
+    monkeypatch.setattr(
+        orchestrator,
+        "generate_tikz",
+        lambda *a, **k: "\\draw (0,0); % note \\draw (1,1);",
+    )
+    pipeline_mocks.compile_ok = [False]
+    pipeline_mocks.fix_returns = lambda tikz: tikz.replace("% note ", "% note\n")
+    pipeline_mocks.scores = [9.0]
+    result = orchestrator.convert(dummy_png, tmp_path / "out", max_iters=5)
+    assert result is not None
+    assert pipeline_mocks.calls["fix"] == 1
+    assert pipeline_mocks.calls["compile"] == 2
+
+
+def test_blank_line_removal_fix_is_retried(tmp_path, dummy_png, pipeline_mocks, monkeypatch):
+    # Deleting a stray blank line (\par inside a macro argument) is the
+    # canonical fix for "Paragraph ended before ... was complete" — it must
+    # count as changed code and get recompiled.
+    monkeypatch.setattr(
+        orchestrator,
+        "generate_tikz",
+        lambda *a, **k: "\\node {multi\n\nline};",
+    )
+    pipeline_mocks.compile_ok = [False]
+    pipeline_mocks.fix_returns = lambda tikz: tikz.replace("\n\n", "\n")
+    pipeline_mocks.scores = [9.0]
+    result = orchestrator.convert(dummy_png, tmp_path / "out", max_iters=5)
+    assert result is not None
+    assert pipeline_mocks.calls["fix"] == 1
+    assert pipeline_mocks.calls["compile"] == 2
+
+
+def test_writes_final_outputs(tmp_path, dummy_png, pipeline_mocks):
+    pipeline_mocks.scores = [9.0]
+    out_dir = tmp_path / "out"
+    result = orchestrator.convert(dummy_png, out_dir, max_iters=5)
+    assert result is not None
+    assert result.tex_path == out_dir / "final.tex"
+    assert result.png_path == out_dir / "final.png"
+    assert result.tex_path.exists()
+    assert result.png_path.exists()
@@ -0,0 +1,53 @@
+"""Tests for sketch2fig.prompts — Tier 1 (fast)."""
+
+import ast
+from pathlib import Path
+
+from sketch2fig.prompts import (
+    compile_fix_user,
+    generator_user,
+    planner_user,
+    refiner_user,
+)
+
+
+def test_no_duplicate_top_level_names():
+    """Guard against a pasted-in second copy of a prompt silently winning."""
+    source = Path(__file__).parent.parent / "src" / "sketch2fig" / "prompts.py"
+    names: list[str] = []
+    for node in ast.parse(source.read_text()).body:
+        if isinstance(node, ast.FunctionDef):
+            names.append(node.name)
+        elif isinstance(node, ast.Assign):
+            names.extend(t.id for t in node.targets if isinstance(t, ast.Name))
+    duplicates = {n for n in names if names.count(n) > 1}
+    assert not duplicates, f"Duplicate top-level definitions: {duplicates}"
+
+
+class TestPlannerUser:
+    def test_clean_adds_instructions(self):
+        assert len(planner_user(clean=True)) > len(planner_user(clean=False))
+
+    def test_base_included_in_both(self):
+        assert planner_user(clean=False) in planner_user(clean=True)
+
+
+class TestTemplateSubstitution:
+    def test_generator_user_includes_plan(self):
+        assert '{"figure_type": "plot"}' in generator_user('{"figure_type": "plot"}', "")
+
+    def test_generator_user_notes_missing_preamble(self):
+        assert "no custom preamble" in generator_user("{}", "")
+
+    def test_generator_user_includes_preamble(self):
+        assert r"\usepackage{xcolor}" in generator_user("{}", r"\usepackage{xcolor}")
+
+    def test_refiner_user_includes_code_and_critique(self):
+        msg = refiner_user(r"\draw (0,0);", '{"issues": []}')
+        assert r"\draw (0,0);" in msg
+        assert '{"issues": []}' in msg
+
+    def test_compile_fix_user_includes_code_and_error(self):
+        msg = compile_fix_user(r"\badcommand", "Undefined control sequence")
+        assert r"\badcommand" in msg
+        assert "Undefined control sequence" in msg
@@ -0,0 +1,64 @@
+"""Tests for sketch2fig.similarity — Tier 1 (fast, no rendering)."""
+
+import pytest
+from PIL import Image
+
+from sketch2fig.similarity import compute_ssim, compute_ssim_batch, images_match
+
+
+def _solid(color: int, size: tuple[int, int] = (64, 64)) -> Image.Image:
+    return Image.new("L", size, color)
+
+
+def _checkerboard(size: tuple[int, int] = (64, 64)) -> Image.Image:
+    img = Image.new("L", size)
+    img.putdata([255 if (x + y) % 2 else 0 for y in range(size[1]) for x in range(size[0])])
+    return img
+
+
+class TestComputeSsim:
+    def test_identical_images_score_one(self):
+        img = _checkerboard()
+        assert compute_ssim(img, img) == pytest.approx(1.0)
+
+    def test_equal_copies_score_exactly_one(self):
+        # Byte-identical images take the short-circuit path.
+        assert compute_ssim(_checkerboard(), _checkerboard()) == 1.0
+
+    def test_very_different_images_score_low(self):
+        assert compute_ssim(_solid(0), _solid(255)) < 0.5
+
+    def test_mismatched_sizes_are_handled(self):
+        score = compute_ssim(_checkerboard((64, 64)), _checkerboard((128, 96)))
+        assert isinstance(score, float)
+
+    def test_large_images_are_downsampled_for_comparison(self):
+        # 1200x900 exceeds the comparison cap; the score must still behave.
+        assert compute_ssim(_solid(128, (1200, 900)), _solid(128, (1200, 900))) == pytest.approx(1.0)
+        assert compute_ssim(_solid(0, (1200, 900)), _solid(255, (1200, 900))) < 0.5
+
+    def test_rgb_inputs_are_converted(self):
+        img = Image.new("RGB", (32, 32), (200, 30, 30))
+        assert compute_ssim(img, img) == pytest.approx(1.0)
+
+
+class TestImagesMatch:
+    def test_identical_images_match(self):
+        img = _checkerboard()
+        assert images_match(img, img)
+
+    def test_different_images_rejected(self):
+        assert not images_match(_solid(0), _solid(255))
+
+
+class TestComputeSsimBatch:
+    def test_empty_input(self):
+        assert compute_ssim_batch([]) == []
+
+    def test_matches_single_pair_scores(self):
+        pairs = [
+            (_checkerboard(), _checkerboard()),
+            (_solid(0), _solid(255)),
+        ]
+        batch = compute_ssim_batch(pairs)
+        assert batch == pytest.approx([compute_ssim(a, b) for a, b in pairs])